@@ -1,13 +1,20 @@
+import asyncio
+from typing import List
+
 import aiohttp
 
 from fastapi import FastAPI
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 
+from core.globals import FILES_DIR
+from core.logger import warn
 from core.repositories.repo_files import FilesRepository
 from core.routers.router_base import BaseRouter
 from core.routers.router_files import FilesRouter
 from core.routers.router_mcpl import MCPLRouter
+from core.workers.w_abstract import AsyncWorker
+from core.workers.w_watchdog import spawn_worker as spawn_worker_watchdog
 
 
 __all__ = ["App"]
@@ -22,6 +29,7 @@ class App(FastAPI):
         super().__init__(*args, **kwargs)
         self.http_session: aiohttp.ClientSession
         self.files_repository = files_repository
+        self.workers: List[AsyncWorker] = []
 
         self._setup_middlewares()
         self.add_event_handler("startup", self._startup_events)
@@ -40,11 +48,25 @@ class App(FastAPI):
     async def _startup_events(self):
         self.http_session = aiohttp.ClientSession()
 
+        self.workers.append(await spawn_worker_watchdog(FILES_DIR, self.files_repository))
+
         for router in self._routers():
             self.include_router(router)
 
 
     async def _shutdown_events(self):
+        for worker in self.workers:
+            worker.task.cancel()
+            try:
+                await asyncio.wait_for(worker.task, timeout=5)
+            except asyncio.CancelledError:
+                pass
+            except asyncio.TimeoutError:
+                warn(f"{worker.name} didn't finish in time")
+            except Exception:
+                # already reported by the worker's done callback
+                pass
+
         if self.http_session:
             await self.http_session.close()
 
@@ -2,7 +2,7 @@ import asyncio
 
 import uvloop
 
-from core.globals import BASE_DIR, FILES_DIR
+from core.globals import BASE_DIR
 from core.logger import init_logger, info
 from core.app import App
 from core.repositories.repo_files import FilesRepository
@@ -10,7 +10,6 @@ from core.server import Server, setup_signal_handlers
 
 from core.workers.w_extractor import spawn_worker as spawn_worker_doc_extractor
 from core.workers.w_processor import spawn_worker as spawn_worker_doc_processor
-from core.workers.w_watchdog import spawn_worker as spawn_worker_watchdog
 
 
 def main():
@@ -22,7 +21,6 @@ def main():
 
     files_repository = FilesRepository(db_dir / "files.db")
 
-    watchdog_worker = spawn_worker_watchdog(FILES_DIR, files_repository)
     doc_e_worker = spawn_worker_doc_extractor(files_repository)
     doc_p_worker = spawn_worker_doc_processor(files_repository)
 
@@ -50,7 +48,6 @@ def main():
         host="0.0.0.0",
         port=8011, # todo: use env values
         workers=[
-            watchdog_worker,
             doc_e_worker,
             doc_p_worker,
         ]
@@ -1,6 +1,6 @@
 import sqlite3
 from datetime import datetime
-from typing import List
+from typing import List, Set, Optional
 
 from pydantic import BaseModel, Field
 
@@ -73,6 +73,10 @@ class FilesRepository(AbstractRepository):
             )
             """)
 
+            conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_files_user_name ON user_files(user_id, file_name_orig)
+            """)
+
             # Add vector_store_id column if it doesn't exist
             try:
                 conn.execute("ALTER TABLE user_files ADD COLUMN vector_store_id TEXT DEFAULT ''")
@@ -104,6 +108,71 @@ class FilesRepository(AbstractRepository):
             except sqlite3.IntegrityError:
                 return False
 
+    def bulk_create_files_sync(self, files: List[FileItem]) -> int:
+        """
+        Create several file records in a single transaction.
+
+        Records which file_name already exists are skipped.
+
+        Args:
+            files: List of FileItem objects to insert
+
+        Returns:
+            Number of records created
+        """
+        if not files:
+            return 0
+
+        with self._get_db_connection() as conn:
+            try:
+                cursor = conn.executemany(
+                    """
+                    INSERT OR IGNORE INTO user_files 
+                    (file_name, file_name_orig, user_id, created_at, processing_status, vector_store_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            file.file_name,
+                            file.file_name_orig,
+                            file.user_id,
+                            file.created_at.isoformat(),
+                            file.processing_status,
+                            file.vector_store_id
+                        )
+                        for file in files
+                    ]
+                )
+                conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error:
+                conn.rollback()
+                return 0
+
+    def get_existing_names_sync(self, file_names: List[str], chunk_size: int = 500) -> Set[str]:
+        """
+        Get which of the given file names already have records.
+
+        Args:
+            file_names: List of file names to check
+            chunk_size: Max number of names per query, keeps query under SQLite's variables limit
+
+        Returns:
+            Set of file names that exist in the repository
+        """
+        existing = set()
+        with self._get_db_connection() as conn:
+            for i in range(0, len(file_names), chunk_size):
+                chunk = file_names[i:i + chunk_size]
+                placeholders = ','.join(['?' for _ in chunk])
+                cursor = conn.execute(
+                    f"SELECT file_name FROM user_files WHERE file_name IN ({placeholders})",
+                    chunk
+                )
+                existing.update(row[0] for row in cursor.fetchall())
+
+        return existing
+
     def get_files_by_filter_sync(self, filter: str, params: tuple = ()) -> List[FileItem]:
         """
         Get files based on a custom filter expression.
@@ -137,6 +206,42 @@ class FilesRepository(AbstractRepository):
 
             return files
 
+    def get_file_by_name_sync(self, user_id: int, file_name_orig: str) -> Optional[FileItem]:
+        """
+        Get user's file by its original name, the newest one if names are duplicated.
+
+        Args:
+            user_id: ID of the user who owns the file
+            file_name_orig: Original filename provided by the user
+
+        Returns:
+            FileItem if found, None otherwise
+        """
+        with self._get_db_connection() as conn:
+            cursor = conn.execute(
+                """
+                SELECT file_name, file_name_orig, user_id, created_at, processing_status, vector_store_id
+                FROM user_files
+                WHERE user_id = ? AND file_name_orig = ?
+                ORDER BY created_at DESC
+                LIMIT 1
+                """,
+                (user_id, file_name_orig)
+            )
+
+            row = cursor.fetchone()
+            if not row:
+                return None
+
+            return FileItem(
+                file_name=row[0],
+                file_name_orig=row[1],
+                user_id=row[2],
+                created_at=datetime.fromisoformat(row[3]),
+                processing_status=row[4],
+                vector_store_id=row[5]
+            )
+
     def delete_file_sync(self, file_name: str) -> bool:
         with self._get_db_connection() as conn:
             try:
@@ -243,6 +348,30 @@ class FilesRepository(AbstractRepository):
     async def create_file(self, file: FileItem) -> bool:
         return await self._run_in_thread(self.create_file_sync, file)
 
+    async def bulk_create_files(self, files: List[FileItem]) -> int:
+        """
+        Async version of bulk_create_files_sync.
+
+        Args:
+            files: List of FileItem objects to insert
+
+        Returns:
+            Number of records created
+        """
+        return await self._run_in_thread(self.bulk_create_files_sync, files)
+
+    async def get_existing_names(self, file_names: List[str]) -> Set[str]:
+        """
+        Async version of get_existing_names_sync.
+
+        Args:
+            file_names: List of file names to check
+
+        Returns:
+            Set of file names that exist in the repository
+        """
+        return await self._run_in_thread(self.get_existing_names_sync, file_names)
+
     async def get_files_by_filter(self, filter: str, params: tuple = ()) -> List[FileItem]:
         """
         Async version of get_files_by_filter_sync.
@@ -263,6 +392,19 @@ class FilesRepository(AbstractRepository):
         """
         return await self._run_in_thread(self.get_files_by_filter_sync, filter, params)
 
+    async def get_file_by_name(self, user_id: int, file_name_orig: str) -> Optional[FileItem]:
+        """
+        Async version of get_file_by_name_sync.
+
+        Args:
+            user_id: ID of the user who owns the file
+            file_name_orig: Original filename provided by the user
+
+        Returns:
+            FileItem if found, None otherwise
+        """
+        return await self._run_in_thread(self.get_file_by_name_sync, user_id, file_name_orig)
+
     async def delete_file(self, file_name: str) -> bool:
         return await self._run_in_thread(self.delete_file_sync, file_name)
 
@@ -300,3 +442,15 @@ class FilesRepository(AbstractRepository):
             success = await repo.update_file("document.pdf", updated_file)
         """
         return await self._run_in_thread(self.update_file_sync, file_name, file_item)
+
+    async def cleanup_missing_files(self, existing_files: List[str]) -> int:
+        """
+        Async version of cleanup_missing_files_sync.
+
+        Args:
+            existing_files: List of file names that exist on disk
+
+        Returns:
+            Number of records removed
+        """
+        return await self._run_in_thread(self.cleanup_missing_files_sync, existing_files)
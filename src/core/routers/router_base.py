@@ -1,4 +1,5 @@
 from fastapi import APIRouter
+from fastapi.responses import HTMLResponse
 from scalar_fastapi import get_scalar_api_reference
 
 
@@ -6,10 +7,13 @@ class BaseRouter(APIRouter):
     def __init__(self):
         super().__init__()
 
+        # the page is static, render it once instead of on every /docs hit
+        self._scalar_html = get_scalar_api_reference(
+            openapi_url="/v1/openapi.json",
+            title="Doc RAG Api Ref",
+        ).body
+
         self.add_api_route("/docs", self._scalar, methods=["GET"], include_in_schema=False)
 
     async def _scalar(self):
-        return get_scalar_api_reference(
-            openapi_url="/v1/openapi.json",
-            title="Doc RAG Api Ref",
-        )
+        return HTMLResponse(self._scalar_html)
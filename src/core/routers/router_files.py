@@ -16,6 +16,7 @@ from core.globals import FILES_DIR
 from core.logger import exception
 from core.repositories.repo_files import FilesRepository, FileItem
 from core.routers.schemas import error_constructor, ErrorResponse
+from core.tools.tool_search_in_file import invalidate as invalidate_user_files
 
 
 class DeleteFilePost(BaseModel):
@@ -268,6 +269,7 @@ class FilesRouter(APIRouter):
 
         resp = await self._files_repository.create_file(file)
         if resp:
+            invalidate_user_files(file.user_id)
             return Response(status_code=201, content={"message": "added record of file in DB"})
         else:
             return error_constructor(
@@ -294,8 +296,12 @@ class FilesRouter(APIRouter):
         - 404: If the file record could not be deleted or was not found
         ```
         """
+        files = await self._files_repository.get_files_by_filter("file_name = ?", (post.file_name,))
+
         resp = await self._files_repository.delete_file(post.file_name)
         if resp:
+            for file in files:
+                invalidate_user_files(file.user_id)
             return Response(status_code=200, content={"message": "record of file deleted"})
         else:
             return error_constructor(
@@ -423,6 +429,7 @@ class FilesRouter(APIRouter):
 
             if not await self._files_repository.create_file(file_item):
                 raise Exception("Failed to save file information to database")
+            invalidate_user_files(user_id)
 
             return FileUploadResponse(
                 status="success",
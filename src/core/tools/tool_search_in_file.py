@@ -1,13 +1,17 @@
 import json
 import time
+import difflib
 
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple, Optional
 
 from core.logger import warn, error, info
 from core.processing.p_utils import generate_paragraph_id
+from core.repositories.repo_files import FileItem
 from core.tools.tool_context import ToolContext
 from core.tools.tool_utils import build_tool_call
-from openai_wrappers.api_vector_store import VectorStoreSearch, vector_store_search
+from core.tools.tool_vector_searcher import search_vector_store
+from openai_wrappers.api_vector_store import VectorStoreSearch, VectorStoreSearchRespItem
 from chat_tools.tool_usage.tool_abstract import Tool, ToolProps
 from openai_wrappers.types import (
     ToolCall, ChatMessage,
@@ -47,6 +51,92 @@ SYSTEM = """TOOL: search_in_doc
           Would you like me to help yo with anything else?
 """
 
+# Tool's schema and props are immutable: build them once instead of on every tools listing
+_CHAT_TOOL = ChatTool(
+    type="function",
+    function=ChatToolFunction(
+        name="search_in_doc",
+        description="Searches for relevant information within a specified document.",
+        parameters=ChatToolParameters(
+            type="object",
+            properties={
+                "document_name": ChatToolParameterProperty(
+                    type="string",
+                    description="The name of the document to search within.",
+                    enum=[]
+                ),
+                "query": ChatToolParameterProperty(
+                    type="string",
+                    description="The search query to find relevant information.",
+                    enum=[]
+                ),
+                # todo: add filters
+            },
+            required=["document_name", "query"]
+        )
+    )
+)
+
+_PROPS = ToolProps(
+    tool_name="search_in_doc",
+    system_prompt=SYSTEM,
+    depends_on=["list_documents"]
+)
+
+USER_FILES_CACHE_TTL = 30.0
+USER_FILES_CACHE_MAXSIZE = 512
+
+# user_id -> (expires_at, {file_name_orig: FileItem}); holds only documents that were looked up
+_user_files_cache: Dict[int, Tuple[float, Dict[str, FileItem]]] = {}
+
+
+def invalidate(user_id: int) -> None:
+    """Drop cached files of a user, call whenever user's files are created or deleted."""
+    _user_files_cache.pop(user_id, None)
+
+
+def _cache_get(user_id: int, file_name_orig: str) -> Optional[FileItem]:
+    entry = _user_files_cache.get(user_id)
+    if not entry:
+        return None
+    expires_at, files_by_name = entry
+    if expires_at < time.monotonic():
+        invalidate(user_id)
+        return None
+    return files_by_name.get(file_name_orig)
+
+
+def _cache_put(user_id: int, file: FileItem) -> None:
+    entry = _user_files_cache.get(user_id)
+    if not entry or entry[0] < time.monotonic():
+        if len(_user_files_cache) >= USER_FILES_CACHE_MAXSIZE:
+            # evict the entry that expires first
+            oldest = min(_user_files_cache, key=lambda k: _user_files_cache[k][0])
+            invalidate(oldest)
+        entry = (time.monotonic() + USER_FILES_CACHE_TTL, {})
+        _user_files_cache[user_id] = entry
+    entry[1][file.file_name_orig] = file
+
+
+SEARCH_RESULTS_CACHE_MAXSIZE = 1024
+
+# VectorStoreSearch as json -> search results; only results of complete documents are cached
+_search_results_cache: OrderedDict[str, List[VectorStoreSearchRespItem]] = OrderedDict()
+
+
+def _search_results_cache_get(key: str) -> Optional[List[VectorStoreSearchRespItem]]:
+    resp = _search_results_cache.get(key)
+    if resp is not None:
+        _search_results_cache.move_to_end(key)
+    return resp
+
+
+def _search_results_cache_put(key: str, resp: List[VectorStoreSearchRespItem]) -> None:
+    _search_results_cache[key] = resp
+    _search_results_cache.move_to_end(key)
+    while len(_search_results_cache) > SEARCH_RESULTS_CACHE_MAXSIZE:
+        _search_results_cache.popitem(last=False)
+
 
 class ToolSearchInFile(Tool):
     """
@@ -106,26 +196,29 @@ class ToolSearchInFile(Tool):
         document_name = args.get("document_name")
         query = args.get("query")
 
-        try:
-            files = await ctx.files_repository.get_files_by_filter(
-                "user_id=?",
-                (ctx.user_id,)
-            )
-        except Exception as e:
-            err = f"Error while executing tool {self.name}: couldn't get user's documents: {str(e)}"
-            warn(err)
-            return False, [
-                build_tool_call(
-                    err, tool_call
-                )
-            ]
+        document = _cache_get(ctx.user_id, document_name)
+
+        # re-fetch on miss, or if cached document is not yet indexed -- its status might have changed
+        if not document or not document.vector_store_id:
+            try:
+                document = await ctx.files_repository.get_file_by_name(ctx.user_id, document_name)
+            except Exception as e:
+                err = f"Error while executing tool {self.name}: couldn't get user's document: {str(e)}"
+                warn(err)
+                return False, [
+                    build_tool_call(
+                        err, tool_call
+                    )
+                ]
+
+            if document:
+                _cache_put(ctx.user_id, document)
 
-        document = next((f for f in files if f.file_name_orig == document_name), None)
         if not document:
             return False, [
                 build_tool_call(
                     f"Error while executing tool {self.name}: document {document_name} not found."
-                    f"All documents:\n{json.dumps([f.model_dump() for f in files])}",
+                    f"{await self._similar_documents_hint(ctx, document_name)} Call list_documents to get all documents.",
                     tool_call
                 )
             ]
@@ -135,88 +228,96 @@ class ToolSearchInFile(Tool):
             query=query
         )
 
-        try:
-            start_time = time.time()
-            resp = await vector_store_search(ctx.http_session, post)
-            info(f"Vector store search for '{query}' took {time.time() - start_time:.3f} seconds")
-        except Exception as e:
-            err = f"Error while executing tool {self.name}: vector store search failed: {str(e)}"
-            error(err)
-            return False, [
+        # results of a complete document do not change, while incomplete one is still being indexed
+        cacheable = document.processing_status == "complete"
+        cache_key = post.model_dump_json()
+
+        resp = _search_results_cache_get(cache_key) if cacheable else None
+        if resp is None:
+            try:
+                start_time = time.time()
+                resp = await search_vector_store(ctx.http_session, post)
+                info(f"Vector store search for '{query}' took {time.time() - start_time:.3f} seconds")
+            except Exception as e:
+                err = f"Error while executing tool {self.name}: vector store search failed: {str(e)}"
+                error(err)
+                return False, [
+                    build_tool_call(
+                        err, tool_call
+                    )
+                ]
+
+            if cacheable:
+                _search_results_cache_put(cache_key, resp)
+
+        # at least one chunk survives dedup if there is any, so content can't be empty past this check
+        if not any(obj.content for obj in resp):
+            return True, [
                 build_tool_call(
-                    err, tool_call
+                    f"No results found for the query: {query}.",
+                    tool_call
                 )
             ]
 
         content = []
+        seen_texts = set()
         for obj in resp:
+            # overlapping chunks may surface the same text several times: dedup before parsing anything
+            texts = []
+            for content_i in obj.content:
+                if content_i.text not in seen_texts:
+                    seen_texts.add(content_i.text)
+                    texts.append(content_i.text)
+            if not texts:
+                continue
+
+            attributes = obj.attributes or {}
             highlight_box = None
             try:
-                highlight_box = json.loads(obj.attributes.get("paragraph_box", json.dumps(None)))
+                highlight_box = json.loads(attributes.get("paragraph_box", json.dumps(None)))
             except Exception:
                 pass
             page_n = None
             try:
-                page_n = int(obj.attributes.get("page_n", None))
+                page_n = int(attributes.get("page_n", None))
             except Exception:
                 pass
 
-            section_name = obj.attributes.get("section_number")
-
-            for content_i in obj.content:
-                paragraph_id = obj.attributes.get("paragraph_id", generate_paragraph_id(content_i.text))
+            section_name = attributes.get("section_number")
+            paragraph_id = attributes.get("paragraph_id")
 
+            for text in texts:
                 content.append(ChatMessageContentItemDocSearch(
-                    paragraph_id=paragraph_id,
-                    text=content_i.text,
+                    paragraph_id=paragraph_id or generate_paragraph_id(text),
+                    text=text,
                     type="doc_search",
                     highlight_box=highlight_box,
                     page_n=page_n,
                     section_name=section_name,
                 ))
 
-        if not content:
-            return True, [
-                build_tool_call(
-                    f"No results found for the query: {query}.",
-                    tool_call
-                )
-            ]
         return True, [
             build_tool_call(
                 content, tool_call
             )
         ]
 
-    def as_chat_tool(self) -> ChatTool:
-        return ChatTool(
-            type="function",
-            function=ChatToolFunction(
-                name="search_in_doc",
-                description="Searches for relevant information within a specified document.",
-                parameters=ChatToolParameters(
-                    type="object",
-                    properties={
-                        "document_name": ChatToolParameterProperty(
-                            type="string",
-                            description="The name of the document to search within.",
-                            enum=[]
-                        ),
-                        "query": ChatToolParameterProperty(
-                            type="string",
-                            description="The search query to find relevant information.",
-                            enum=[]
-                        ),
-                        # todo: add filters
-                    },
-                    required=["document_name", "query"]
-                )
+    @staticmethod
+    async def _similar_documents_hint(ctx: ToolContext, document_name: str) -> str:
+        try:
+            files = await ctx.files_repository.get_files_by_filter(
+                "user_id=?",
+                (ctx.user_id,)
             )
-        )
+        except Exception as e:
+            warn(f"Couldn't get user's documents: {str(e)}")
+            return ""
+
+        close_names = difflib.get_close_matches(document_name, list({f.file_name_orig for f in files}), n=5, cutoff=0.4)
+        return f" Similar documents: {', '.join(close_names)}." if close_names else ""
+
+    def as_chat_tool(self) -> ChatTool:
+        return _CHAT_TOOL
 
     def props(self):
-        return ToolProps(
-            tool_name=self.name,
-            system_prompt=SYSTEM,
-            depends_on=["list_documents"]
-        )
+        return _PROPS
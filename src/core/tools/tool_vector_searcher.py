@@ -0,0 +1,39 @@
+import asyncio
+
+from typing import List, Dict
+
+import aiohttp
+
+from openai_wrappers.api_vector_store import (
+    VectorStoreSearch, VectorStoreSearchRespItem,
+    vector_store_search
+)
+
+
+__all__ = ["search_vector_store"]
+
+
+# VectorStoreSearch as json -> search request in flight
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def search_vector_store(
+        session: aiohttp.ClientSession,
+        data: VectorStoreSearch
+) -> List[VectorStoreSearchRespItem]:
+    """
+    Performs vector store search, identical searches running concurrently share a single request.
+
+    Tool calls of a turn are executed concurrently, so e.g. the agent repeating the same
+    search_in_doc call pays for one round trip only.
+    """
+    key = data.model_dump_json()
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(vector_store_search(session, data))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # shield: a cancelled caller must not cancel the request other callers are awaiting
+    return await asyncio.shield(task)
@@ -1,4 +1,6 @@
 import json
+import asyncio
+
 from typing import List
 
 from chat_tools import ChatTool
@@ -6,7 +8,7 @@ from chat_tools.tool_usage.tool_abstract import Tool, ToolProps
 
 from core.tools.tool_utils import build_tool_call
 from openai_wrappers.utils import messages_since_last_user_message, get_unanswered_tool_calls
-from openai_wrappers.types import ChatMessage, ChatMessageTool
+from openai_wrappers.types import ChatMessage, ChatMessageTool, ToolCall
 
 from core.tools.tool_context import ToolContext
 from core.tools.tool_list_files import ToolListFiles
@@ -32,6 +34,9 @@ async def execute_tools(ctx: ToolContext, messages: List[ChatMessage]) -> List[C
     2. Parses and validates the arguments
     3. Executes the tool if validation passes
 
+    Tool calls are executed concurrently, so that e.g. several search_in_doc calls
+    issued in one turn overlap their vector searches instead of running one after another.
+
     Args:
         ctx (ToolContext): The context object providing environment and state for tool execution
         messages (List[ChatMessage]): The full conversation history
@@ -43,32 +48,38 @@ async def execute_tools(ctx: ToolContext, messages: List[ChatMessage]) -> List[C
         - Only processes messages since the last user message
         - Handles JSON parsing errors in tool arguments
         - Validates tool arguments before execution
-        - Collects all tool response messages, including error messages
+        - Collects all tool response messages, including error messages, in order of tool calls
     """
     messages = messages_since_last_user_message(messages)
 
+    results = await asyncio.gather(*(
+        _execute_tool_call(ctx, tool_call) for tool_call in get_unanswered_tool_calls(messages)
+    ))
+
+    return [msg for msgs in results for msg in msgs]
+
+
+async def _execute_tool_call(ctx: ToolContext, tool_call: ToolCall) -> List[ChatMessageTool]:
+    tool = next((t for t in TOOLS if t.name == tool_call.function.name), None)
+    if not tool:
+        return []
+
+    try:
+        args = json.loads(tool_call.function.arguments)
+    except json.JSONDecodeError:
+        return [build_tool_call(
+            f"Error: invalid JSON in arguments: {tool_call.function.arguments}", tool_call
+        )]
+
     tool_res_messages = []
-    for tool_call in get_unanswered_tool_calls(messages):
-        tool = next((t for t in TOOLS if t.name == tool_call.function.name), None)
-        if not tool:
-            continue
-
-        try:
-            args = json.loads(tool_call.function.arguments)
-        except json.JSONDecodeError:
-            tool_res_messages.append(build_tool_call(
-                f"Error: invalid JSON in arguments: {tool_call.function.arguments}", tool_call
-            ))
-            continue
-
-        ok, msgs = tool.validate_tool_call_args(ctx, tool_call, args)
-        tool_res_messages.extend(msgs)
-
-        if not ok:
-            continue
-
-        _ok, msgs = await tool.execute(ctx, tool_call, args)
-        tool_res_messages.extend(msgs)
+    ok, msgs = tool.validate_tool_call_args(ctx, tool_call, args)
+    tool_res_messages.extend(msgs)
+
+    if not ok:
+        return tool_res_messages
+
+    _ok, msgs = await tool.execute(ctx, tool_call, args)
+    tool_res_messages.extend(msgs)
 
     return tool_res_messages
 
@@ -1,3 +1,4 @@
+import asyncio
 import threading
 from dataclasses import dataclass
 
@@ -8,3 +9,10 @@ class Worker:
     name: str
     thread: threading.Thread
     stop_event: threading.Event
+
+
+@dataclass
+class AsyncWorker:
+    """Structure to hold worker task running on the app's event loop"""
+    name: str
+    task: asyncio.Task
@@ -7,7 +7,7 @@ from core.globals import FILES_DIR
 from core.logger import info
 from core.repositories.repo_files import FilesRepository
 from core.workers.w_abstract import Worker
-from coxit.extractor.file_reader import FileReader
+from coxit.extractor.file_reader import FileReader, shutdown_pool
 
 
 VISUALIZE = False
@@ -40,43 +40,47 @@ def worker(
            - Update file processing status to "extracted"
         3. Wait before next iteration
     """
-    while not stop_event.is_set():
-        process_files = stats_repository.get_files_by_filter_sync("processing_status = ?", ("",))
-        if not process_files:
-            stop_event.wait(3)
-            continue
-
-        for file in process_files:
-            info(f"Extracting file: {file.file_name_orig}")
-            file_path: Path = FILES_DIR.joinpath(file.file_name)
-
-            if not file_path.is_file():
-                file.processing_status = f"Error: file is missing on disk"
-                stats_repository.update_file_sync(file.file_name, file)
+    try:
+        while not stop_event.is_set():
+            process_files = stats_repository.get_files_by_filter_sync("processing_status = ?", ("",))
+            if not process_files:
+                stop_event.wait(3)
                 continue
 
-            with file_path.open("rb") as f:
-                file_content = f.read()
+            for file in process_files:
+                info(f"Extracting file: {file.file_name_orig}")
+                file_path: Path = FILES_DIR.joinpath(file.file_name)
 
-            file_reader = FileReader(file_content, file.file_name_orig)
-            extracted_paragraphs = file_reader.extract_paragraphs(visualize=VISUALIZE)
+                if not file_path.is_file():
+                    file.processing_status = f"Error: file is missing on disk"
+                    stats_repository.update_file_sync(file.file_name, file)
+                    continue
 
-            if not extracted_paragraphs:
-                file.processing_status = "Error: no paragraphs extracted"
-                stats_repository.update_file_sync(file.file_name, file)
-                continue
+                with file_path.open("rb") as f:
+                    file_content = f.read()
 
-            jsonl_file = file_path.with_suffix('.jsonl')
+                file_reader = FileReader(file_content, file.file_name_orig)
+                extracted_paragraphs = file_reader.extract_paragraphs(visualize=VISUALIZE)
 
-            with jsonl_file.open("w") as f:
-                for par in extracted_paragraphs:
-                    f.write(json.dumps(par.to_dict()) + "\n")
+                if not extracted_paragraphs:
+                    file.processing_status = "Error: no paragraphs extracted"
+                    stats_repository.update_file_sync(file.file_name, file)
+                    continue
 
-            file.processing_status = "extracted"
-            stats_repository.update_file_sync(file.file_name, file)
-            info(f"Extracting file {file.file_name_orig} OK")
+                jsonl_file = file_path.with_suffix('.jsonl')
+
+                with jsonl_file.open("w") as f:
+                    for par in extracted_paragraphs:
+                        f.write(json.dumps(par.to_dict()) + "\n")
+
+                file.processing_status = "extracted"
+                stats_repository.update_file_sync(file.file_name, file)
+                info(f"Extracting file {file.file_name_orig} OK")
 
-        stop_event.wait(1)
+            stop_event.wait(1)
+    finally:
+        # stop extraction worker processes together with the extractor
+        shutdown_pool()
 
 
 def spawn_worker(
@@ -1,183 +1,322 @@
-import queue
+import os
+import errno
+import heapq
+import asyncio
+import itertools
 import time
 import threading
-import re
 
 from pathlib import Path
-from typing import Iterator, Dict
+from typing import Iterator, Dict, List, Tuple, Optional
 
 from watchdog.events import FileSystemEvent, FileSystemEventHandler
 from watchdog.observers import Observer
-from xattr import xattr
 
-from core.logger import info, error, warn
+from core.logger import info, error, warn, exception
 from core.repositories.repo_files import FilesRepository, FileItem
-from core.workers.w_abstract import Worker
+from core.tools.tool_search_in_file import invalidate as invalidate_user_files
+from core.workers.w_abstract import AsyncWorker
 
 
 __all__ = ["spawn_worker"]
 
-FILE_RULE = "*.[pP][dD][fF]"
-PDF_PATTERN = re.compile(r'.*\.pdf$', re.IGNORECASE)
+# Seconds a file must stay unmodified before it's considered completely written
+STABILITY_THRESHOLD = 5.0
 
 
-def add_file_to_db_if_ok(file_path: Path, files_repository: FilesRepository) -> None:
-    files = files_repository.get_files_by_filter_sync("file_name = ?", (file_path.name,))
-    if len(files):
-        info(f"File {file_path.name} already in DB. SKIP")
-        return
+def is_watched_pdf(file_name: str) -> bool:
+    """
+    Whether file is a PDF to be tracked. Hidden files (e.g. editors' '.#doc.pdf' locks or
+    copy tools' partial writes) are skipped; '.part', '.crdownload' and similar temp files
+    end up renamed to the final name and are rejected by the suffix check.
+    """
+    return not file_name.startswith(".") and file_name.lower().endswith(".pdf")
+
+
+def _get_xattr(path: str, name: str) -> str:
+    try:
+        value = os.getxattr(path, name)
+    except OSError as e:
+        if e.errno == errno.ENODATA:
+            return ""
+        raise
+    return value.decode('utf-8', errors='ignore')
+
 
+def read_file_item(file_path: Path) -> Optional[FileItem]:
+    """Build FileItem from file's metadata, returns None if metadata is missing or invalid."""
     try:
-        file_attrs = xattr(str(file_path))
-        user_id = (file_attrs.get('user.user_id') or b"").decode('utf-8', errors='ignore')
-        file_name_orig = (file_attrs.get('user.file_name_orig') or b"").decode('utf-8', errors='ignore')
+        path = str(file_path)
+        user_id = _get_xattr(path, 'user.user_id')
+        file_name_orig = _get_xattr(path, 'user.file_name_orig')
     except Exception as e:
         warn(f"Failed to parse {file_path.name}'s metadata: {e}")
-        return
+        return None
 
     if not user_id:
         warn(f"File {file_path.name} does not contain a user.userid in metadata. SKIP")
-        return
+        return None
 
     if not file_name_orig:
         warn(f"File {file_path.name} does not contain a user.file_name_orig in metadata. SKIP")
-        return
+        return None
 
-    file_item = FileItem(
+    return FileItem(
         file_name=file_path.name,
         file_name_orig=file_name_orig,
         user_id=int(user_id),
     )
 
-    resp = files_repository.create_file_sync(file_item)
+
+async def add_file_to_db_if_ok(file_path: Path, files_repository: FilesRepository) -> None:
+    files = await files_repository.get_files_by_filter("file_name = ?", (file_path.name,))
+    if len(files):
+        info(f"File {file_path.name} already in DB. SKIP")
+        return
+
+    file_item = read_file_item(file_path)
+    if not file_item:
+        return
+
+    resp = await files_repository.create_file(file_item)
 
     if not resp:
         error(f"Failed to create file's {file_item.file_name} record in DB")
         return
 
+    invalidate_user_files(file_item.user_id)
     info(f"Created file {file_item.file_name} record in DB successfully")
 
 
+async def add_files_to_db_if_ok(file_paths: List[Path], files_repository: FilesRepository) -> None:
+    """Bulk version of add_file_to_db_if_ok: one query for existing records, one transaction for inserts."""
+    existing_names = await files_repository.get_existing_names([p.name for p in file_paths])
+
+    new_paths = [p for p in file_paths if p.name not in existing_names]
+    file_items = await asyncio.to_thread(
+        lambda: [item for item in (read_file_item(p) for p in new_paths) if item]
+    )
+    if not file_items:
+        return
+
+    created_count = await files_repository.bulk_create_files(file_items)
+    if created_count != len(file_items):
+        error(f"Created {created_count} of {len(file_items)} file records in DB")
+    else:
+        info(f"Created {created_count} file records in DB successfully")
+
+    for user_id in {item.user_id for item in file_items}:
+        invalidate_user_files(user_id)
+
+
+async def remove_file_from_db(file_path: Path, files_repository: FilesRepository) -> None:
+    file_name = file_path.name
+    for file in await files_repository.get_files_by_filter("file_name = ?", (file_name,)):
+        invalidate_user_files(file.user_id)
+
+    if await files_repository.delete_file(file_name):
+        info(f"Removed file {file_name} from database after deletion from disk")
+    else:
+        warn(f"Failed to remove file {file_name} from database or file not found in database")
+
+
 def scan_existing_files(directory: Path) -> Iterator[Path]:
-    for file_path in directory.glob(FILE_RULE): # non-recursive
-        if file_path.is_file() and PDF_PATTERN.match(file_path.name):
-            yield file_path
+    # non-recursive; DirEntry.is_file() uses file type from readdir, no stat() per file
+    with os.scandir(directory) as it:
+        for entry in it:
+            if is_watched_pdf(entry.name) and entry.is_file():
+                yield Path(entry.path)
 
 
 class EventHandler(FileSystemEventHandler):
-    def __init__(self, files_repository):
+    """
+    Tracks PDF files written to the watched directory until they become stable.
+
+    Event callbacks run in watchdog's observer thread and never touch the DB: the worker coroutine
+    is woken up on the event loop through call_soon_threadsafe and does all DB work there.
+    """
+    def __init__(self, loop: asyncio.AbstractEventLoop, stability_threshold=STABILITY_THRESHOLD):
         super().__init__()
-        self.files_repository = files_repository
-        # Dictionary to track files and their last modification time
-        self._file_timestamps: Dict[Path, float] = {}
+        self.loop = loop
+        self.stability_threshold = stability_threshold
+        # Dictionary to track files and their (last modification time, generation)
+        self._file_timestamps: Dict[Path, Tuple[float, int]] = {}
+        # Min-heap of (stable_at, path, generation); entries with outdated generation are skipped
+        self._deadlines: List[Tuple[float, Path, int]] = []
+        self._generations = itertools.count()
         # Lock to ensure thread safety when modifying the file timestamps dict
         self._lock = threading.Lock()
+        # Event to wake up the worker when file timestamps change, owned by the loop
+        self._changed = asyncio.Event()
+        # Deleted files which records are to be removed from the DB, owned by the loop
+        self.deleted_files: asyncio.Queue[Path] = asyncio.Queue()
+
+    def _notify(self) -> None:
+        self.loop.call_soon_threadsafe(self._changed.set)
+
+    def _track(self, path: Path) -> None:
+        now = time.time()
+        generation = next(self._generations)
+        with self._lock:
+            self._file_timestamps[path] = (now, generation)
+            heapq.heappush(self._deadlines, (now + self.stability_threshold, path, generation))
+        self._notify()
+
+    def _is_outdated(self, entry: Tuple[float, Path, int]) -> bool:
+        _, path, generation = entry
+        tracked = self._file_timestamps.get(path)
+        return tracked is None or tracked[1] != generation
 
     def on_created(self, event: FileSystemEvent) -> None:
         path = Path(event.src_path)
-        if PDF_PATTERN.match(path.name) and path.is_file():
-            with self._lock:
-                self._file_timestamps[path] = time.time()
+        if is_watched_pdf(path.name) and path.is_file():
+            self._track(path)
 
     def on_modified(self, event: FileSystemEvent) -> None:
         path = Path(event.src_path)
-        if PDF_PATTERN.match(path.name) and path.is_file():
-            with self._lock:
-                self._file_timestamps[path] = time.time()
+        if is_watched_pdf(path.name) and path.is_file():
+            self._track(path)
+
+    def _forget(self, path: Path) -> None:
+        # Remove from file timestamps if it's there, its heap entry becomes outdated
+        with self._lock:
+            if path in self._file_timestamps:
+                del self._file_timestamps[path]
+
+        # DB is updated by the worker on the loop, not in the observer thread
+        self.loop.call_soon_threadsafe(self.deleted_files.put_nowait, path)
+        self._notify()
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """
+        Handle renames: the record of the old name is queued for removal, and PDFs renamed into place
+        (e.g. from skipped temp files once they are completely written) are tracked.
+        """
+        src_path = Path(event.src_path)
+        if is_watched_pdf(src_path.name):
+            self._forget(src_path)
+
+        path = Path(event.dest_path)
+        if is_watched_pdf(path.name) and path.is_file():
+            self._track(path)
 
     def on_deleted(self, event: FileSystemEvent) -> None:
-        """Handle file deletion events by removing the corresponding record from the database."""
+        """Handle file deletion events by queueing removal of the corresponding record from the database."""
         path = Path(event.src_path)
-        if PDF_PATTERN.match(path.name):
-            # Remove from file timestamps if it's there
-            with self._lock:
-                if path in self._file_timestamps:
-                    del self._file_timestamps[path]
-
-            file_name = path.name
-            if self.files_repository.delete_file_sync(file_name):
-                info(f"Removed file {file_name} from database after deletion from disk")
-            else:
-                warn(f"Failed to remove file {file_name} from database or file not found in database")
-
-    def get_stable_files(self, stability_threshold=5.0):
+        if is_watched_pdf(path.name):
+            self._forget(path)
+
+    def get_stable_files(self):
         """
-        Returns a list of files that haven't been modified for the specified threshold
+        Returns a list of files that haven't been modified for the stability threshold
         and removes them from the tracking dictionary.
         """
         current_time = time.time()
         stable_files = []
 
         with self._lock:
-            for path, last_modified in list(self._file_timestamps.items()):
-                if current_time - last_modified > stability_threshold:
-                    stable_files.append(path)
-                    del self._file_timestamps[path]
+            while self._deadlines and self._deadlines[0][0] <= current_time:
+                entry = heapq.heappop(self._deadlines)
+                if self._is_outdated(entry):
+                    continue
+                stable_files.append(entry[1])
+                del self._file_timestamps[entry[1]]
 
         return stable_files
 
+    def reset_changes(self) -> None:
+        """
+        Marks pending changes as seen. Call at the start of each worker pass, before handling
+        deleted and stable files, so events arriving during the pass wake up the next wait.
+        """
+        self._changed.clear()
 
-def worker(target_dir: Path, stop_event: threading.Event, files_repository):
-    event_handler = EventHandler(files_repository)
-    observer = Observer()
-    observer.schedule(event_handler, str(target_dir), recursive=False)
-    observer.start()
+    async def wait_for_changes(self) -> None:
+        """
+        Waits until a file event arrives or the earliest tracked file becomes stable.
+        Events since the last reset_changes() make it return immediately.
+        """
+        if not self.deleted_files.empty():
+            return
 
-    # Create a queue for processing stable files
-    file_queue = queue.Queue()
+        timeout = None
+        with self._lock:
+            while self._deadlines and self._is_outdated(self._deadlines[0]):
+                heapq.heappop(self._deadlines)
+            if self._deadlines:
+                timeout = max(self._deadlines[0][0] - time.time(), 0.0)
+
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def worker(target_dir: Path, files_repository: FilesRepository):
+    """
+    Watches target_dir and adds stable PDF files to the DB; runs until cancelled.
+    """
+    event_handler = EventHandler(asyncio.get_running_loop())
+    observer = Observer()
 
     try:
-        while not stop_event.is_set():
-            # Check for stable files and add them to the queue
-            stable_files = event_handler.get_stable_files()
-            for file_path in stable_files:
-                file_queue.put(file_path)
-
-            # Process files from the queue (non-blocking)
-            try:
-                while True:  # Keep processing until queue is empty
-                    file_path = file_queue.get(block=False)
-                    try:
-                        if file_path.exists():  # Make sure file still exists
-                            add_file_to_db_if_ok(file_path, files_repository)
-                        else:
-                            info(f"File {file_path} no longer exists, skipping")
-                    except Exception as e:
-                        error(f"Error processing file {file_path}: {e}")
-                    finally:
-                        file_queue.task_done()
-            except queue.Empty:
-                # Queue is empty, continue with the next iteration
-                pass
-
-            time.sleep(1)
+        observer.schedule(event_handler, str(target_dir), recursive=False)
+        observer.start()
+
+        while True:
+            event_handler.reset_changes()
+
+            while not event_handler.deleted_files.empty():
+                file_path = event_handler.deleted_files.get_nowait()
+                try:
+                    await remove_file_from_db(file_path, files_repository)
+                except Exception as e:
+                    error(f"Error removing file {file_path}: {e}")
+
+            for file_path in event_handler.get_stable_files():
+                try:
+                    if file_path.exists():  # Make sure file still exists
+                        await add_file_to_db_if_ok(file_path, files_repository)
+                    else:
+                        info(f"File {file_path} no longer exists, skipping")
+                except Exception as e:
+                    error(f"Error processing file {file_path}: {e}")
+
+            await event_handler.wait_for_changes()
     finally:
-        observer.stop()
-        observer.join()
+        if observer.is_alive():
+            observer.stop()
+            await asyncio.to_thread(observer.join)
+
 
+def _log_worker_crash(task: asyncio.Task) -> None:
+    # the task is awaited only on shutdown, report a crash while the server keeps running
+    if not task.cancelled() and task.exception() is not None:
+        exception("worker_watchdog crashed, files on disk are no longer watched", exc_info=task.exception())
 
-def spawn_worker(
+
+async def spawn_worker(
         target_dir: Path,
         files_repository: FilesRepository,
-) -> Worker:
-    existing_files = list(scan_existing_files(target_dir))
+) -> AsyncWorker:
+    """
+    Syncs DB with files on disk and starts the watchdog worker on the running event loop.
+    """
+    # watched directory may not exist yet on a fresh checkout, scandir and the observer require it
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    existing_files = await asyncio.to_thread(lambda: list(scan_existing_files(target_dir)))
     existing_file_names = [file_path.name for file_path in existing_files]
 
     # Clean up database records for files that no longer exist on disk
-    removed_count = files_repository.cleanup_missing_files_sync(existing_file_names)
+    removed_count = await files_repository.cleanup_missing_files(existing_file_names)
     if removed_count > 0:
         info(f"Cleaned up {removed_count} database records for files that no longer exist on disk")
 
     # Add existing files to the database
-    for file_path in existing_files:
-        add_file_to_db_if_ok(file_path, files_repository)
-
-    stop_event = threading.Event()
-    worker_thread = threading.Thread(
-        target=worker,
-        args=(target_dir, stop_event, files_repository),
-        daemon=True
-    )
-    worker_thread.start()
+    await add_files_to_db_if_ok(existing_files, files_repository)
+
+    task = asyncio.create_task(worker(target_dir, files_repository))
+    task.add_done_callback(_log_worker_crash)
 
-    return Worker("worker_watchdog", worker_thread, stop_event)
+    return AsyncWorker("worker_watchdog", task)
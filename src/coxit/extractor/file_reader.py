@@ -1,12 +1,93 @@
 """
 File reader executor module.
 """
-from typing import List
+import os
+import hashlib
+import logging
+import threading
+import multiprocessing
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import List, Dict, Tuple, Optional
 
 import pymupdf
 
+from core.logger import init_logger
 from coxit.extractor.highlight_viz import visualize_paragraphs
-from coxit.extractor.paragraph_parser import ParagraphData, ParagraphParser
+from coxit.extractor.paragraph_parser import (
+    ParagraphData, ParagraphParser,
+    apply_heuristics, extract_raw_paragraphs_from_data
+)
+
+
+# Cache only helps byte-identical re-uploads, keep it small: few documents and bounded total text size
+PARAGRAPHS_CACHE_MAXSIZE = 8
+PARAGRAPHS_CACHE_MAX_CHARS = 4_000_000
+# Min pages per worker process; smaller documents are extracted in-process, as shipping them to workers costs more than it saves
+PARALLEL_MIN_PAGES = 32
+
+# blake2b digest of file_data -> extracted paragraphs
+_paragraphs_cache: OrderedDict[bytes, List[ParagraphData]] = OrderedDict()
+# total paragraph_text length of cached documents
+_paragraphs_cache_chars = 0
+
+
+def _paragraphs_chars(paragraphs: List[ParagraphData]) -> int:
+    return sum(len(p.paragraph_text) for p in paragraphs)
+
+
+def _paragraphs_cache_put(key: bytes, paragraphs: List[ParagraphData]) -> None:
+    global _paragraphs_cache_chars
+
+    chars = _paragraphs_chars(paragraphs)
+    if chars > PARAGRAPHS_CACHE_MAX_CHARS:
+        return
+
+    _paragraphs_cache[key] = paragraphs
+    _paragraphs_cache_chars += chars
+    while (
+            len(_paragraphs_cache) > PARAGRAPHS_CACHE_MAXSIZE
+            or _paragraphs_cache_chars > PARAGRAPHS_CACHE_MAX_CHARS
+    ):
+        _, evicted = _paragraphs_cache.popitem(last=False)
+        _paragraphs_cache_chars -= _paragraphs_chars(evicted)
+
+# Worker processes are spawned once, on first large document, and reused for all following ones
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _available_cpus() -> int:
+    # respects CPU affinity (e.g. docker's --cpuset-cpus), unlike os.cpu_count()
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: the server process runs threads, forking it is unsafe
+            # spawned processes start with unconfigured logging: set it up as in the server process
+            _pool = ProcessPoolExecutor(
+                max_workers=_available_cpus(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_logger,
+                initargs=(logging.getLogger().isEnabledFor(logging.DEBUG),)
+            )
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stops extraction worker processes, if they were started."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
 
 
 class FileReader:
@@ -25,12 +106,31 @@ class FileReader:
     def extract_paragraphs(self, visualize: bool = False) -> List[ParagraphData]:
         """
         Extracts paragraphs from a PDF file with section information.
+
+        Results are cached by file content, so extracting the same PDF again is instant.
+        Paragraphs returned from cache are shared, they should not be modified.
         """
-        # Open the PDF document
-        pdf_doc = pymupdf.open(stream=self._file_data, filetype="pdf")
+        key = hashlib.blake2b(self._file_data, digest_size=16).digest()
+
+        paragraphs = _paragraphs_cache.get(key)
+        if paragraphs is not None:
+            _paragraphs_cache.move_to_end(key)
+        else:
+            # Open the PDF document, close it as soon as paragraphs are extracted to free MuPDF's memory
+            with pymupdf.open(stream=self._file_data, filetype="pdf") as pdf_doc:
+                page_count = pdf_doc.page_count
+                workers_n = min(_available_cpus(), page_count // PARALLEL_MIN_PAGES)
+                if workers_n <= 1:
+                    raw_paragraphs, page_dimensions = ParagraphParser(pdf_doc).extract_raw_paragraphs(range(page_count))
+
+            if workers_n > 1:
+                raw_paragraphs, page_dimensions = self._extract_raw_paragraphs_parallel(page_count, workers_n)
+
+            paragraphs = apply_heuristics(raw_paragraphs, page_dimensions)
+
+            _paragraphs_cache_put(key, paragraphs)
 
-        paragraph_parser = ParagraphParser(pdf_doc)
-        paragraphs = paragraph_parser.extract_paragraphs()
+        paragraphs = list(paragraphs)
 
         if visualize:
             output_dir = f"highlighted_paragraphs_{self._file_name}"
@@ -43,3 +143,26 @@ class FileReader:
             print(f"Paragraph visualization saved to {output_dir}")
 
         return paragraphs
+
+    def _extract_raw_paragraphs_parallel(
+            self,
+            page_count: int,
+            workers_n: int
+    ) -> Tuple[List[ParagraphData], Dict[int, Dict[str, float]]]:
+        """
+        Extracts raw paragraphs in worker processes, each one handles a contiguous range of pages.
+        """
+        chunk_size = -(-page_count // workers_n)
+        page_ranges = [range(i, min(i + chunk_size, page_count)) for i in range(0, page_count, chunk_size)]
+
+        paragraphs = []
+        page_dimensions = {}
+
+        for chunk_paragraphs, chunk_dimensions in _get_pool().map(
+                partial(extract_raw_paragraphs_from_data, self._file_data),
+                page_ranges
+        ):
+            paragraphs.extend(chunk_paragraphs)
+            page_dimensions.update(chunk_dimensions)
+
+        return paragraphs, page_dimensions
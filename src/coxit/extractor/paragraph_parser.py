@@ -1,7 +1,7 @@
 import re
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Tuple, Set
+from typing import Optional, List, Dict, Tuple, Set, Iterable
 
 import pymupdf
 
@@ -416,6 +416,43 @@ def heur5_filter_short_paragraphs(paragraphs: List[ParagraphData]) -> List[Parag
     return calculate_paragraph_dimensions_and_overlaps(filtered_paragraphs)
 
 
+def apply_heuristics(
+        paragraphs: List[ParagraphData],
+        page_dimensions: Dict[int, Dict[str, float]]
+) -> List[ParagraphData]:
+    """
+    Applies all heuristics to raw paragraphs of a document.
+
+    Args:
+        paragraphs: Raw paragraphs of all pages, in page order
+        page_dimensions: Dictionary mapping page numbers (0-based) to their dimensions
+
+    Returns:
+        The processed list of paragraphs
+    """
+    paragraphs = calculate_paragraph_dimensions_and_overlaps(paragraphs)
+
+    paragraphs = heur1_minimize_overlapping_boxes(paragraphs, page_dimensions)
+    paragraphs = heur2_standardize_paragraph_width(paragraphs, page_dimensions)
+    paragraphs = heur3_ignore_header_footer_paragraphs(paragraphs, page_dimensions)
+    paragraphs = heur4_extend_non_overlapping_paragraphs(paragraphs, page_dimensions)
+    paragraphs = heur5_filter_short_paragraphs(paragraphs)
+
+    return paragraphs
+
+
+def extract_raw_paragraphs_from_data(
+        file_data: bytes,
+        page_nums: Iterable[int]
+) -> Tuple[List[ParagraphData], Dict[int, Dict[str, float]]]:
+    """
+    Opens a PDF from bytes and extracts raw paragraphs of the given pages.
+    Module-level so it can be run in a worker process.
+    """
+    with pymupdf.open(stream=file_data, filetype="pdf") as pdf_doc:
+        return ParagraphParser(pdf_doc).extract_raw_paragraphs(page_nums)
+
+
 class ParagraphParser:
     """
     Extracts paragraphs with their bounding boxes from PDF pages.
@@ -429,10 +466,24 @@ class ParagraphParser:
         """
         Extracts paragraphs with their bounding boxes from all pages.
         """
+        paragraphs, page_dimensions = self.extract_raw_paragraphs(range(self.pdf_doc.page_count))
+
+        return apply_heuristics(paragraphs, page_dimensions)
+
+    def extract_raw_paragraphs(
+            self,
+            page_nums: Iterable[int]
+    ) -> Tuple[List[ParagraphData], Dict[int, Dict[str, float]]]:
+        """
+        Extracts paragraphs of the given pages without applying heuristics.
+
+        Returns:
+            A tuple of paragraphs and a dictionary mapping page numbers (0-based) to their dimensions
+        """
         paragraphs = []
         page_dimensions = {}
 
-        for page_num in range(self.pdf_doc.page_count):
+        for page_num in page_nums:
             page = self.pdf_doc.load_page(page_num)
 
             page_rect = page.rect
@@ -448,17 +499,7 @@ class ParagraphParser:
             page_paragraphs = self._extract_page_paragraphs(page, page_num)
             paragraphs.extend(page_paragraphs)
 
-        # applying heuristics
-
-        paragraphs = calculate_paragraph_dimensions_and_overlaps(paragraphs)
-
-        paragraphs = heur1_minimize_overlapping_boxes(paragraphs, page_dimensions)
-        paragraphs = heur2_standardize_paragraph_width(paragraphs, page_dimensions)
-        paragraphs = heur3_ignore_header_footer_paragraphs(paragraphs, page_dimensions)
-        paragraphs = heur4_extend_non_overlapping_paragraphs(paragraphs, page_dimensions)
-        paragraphs = heur5_filter_short_paragraphs(paragraphs)
-
-        return paragraphs
+        return paragraphs, page_dimensions
 
     def _extract_page_paragraphs(self, page: pymupdf.Page, page_num: int) -> List[ParagraphData]:
         """